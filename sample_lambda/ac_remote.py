@@ -1,14 +1,15 @@
 import logging
 import os
-import boto3
 import json
+from aws_session import create_client
+from log_level import get_log_level
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+logger.setLevel(get_log_level())
 
 class AcRemote:
     def __init__(self):
-        self.client = boto3.client('iot-data', region_name=os.environ['Region'])
+        self.client = create_client('iot-data')
         self.thingName = os.environ['ThingName']
         
         self.update_data()
@@ -44,10 +45,7 @@ class AcRemote:
 
     def get_power(self):
         self.update_data()
-        if self.power == 1:
-            return "ON"
-        else:
-            return "OFF"
+        return self.power_value()
 
     def get_temperature(self):
         self.update_data()
@@ -55,6 +53,20 @@ class AcRemote:
 
     def get_mode(self):
         self.update_data()
+        return self.mode_value()
+
+    def get_state(self):
+        # read the shadow once for every value reported to Alexa
+        self.update_data()
+        return {"power": self.power_value(), "temp": self.temp, "mode": self.mode_value()}
+
+    def power_value(self):
+        if self.power == 1:
+            return "ON"
+        else:
+            return "OFF"
+
+    def mode_value(self):
         if self.mode == 1:
             return "HEAT"
         elif self.mode == 2:
@@ -0,0 +1,19 @@
+import os
+import threading
+import boto3
+
+# Use the regional STS endpoint and pin the default region to skip endpoint/metadata probing.
+# AWS_LAMBDA_EXEC_WRAPPER is deliberately left alone; only set it in the function configuration if needed.
+if 'Region' in os.environ:
+    os.environ.setdefault('AWS_STS_REGIONAL_ENDPOINTS', 'regional')
+    os.environ.setdefault('AWS_DEFAULT_REGION', os.environ['Region'])
+
+# One session per container, shared by every module-level client so credentials are resolved once
+SESSION = boto3.session.Session(region_name=os.environ.get('Region'))
+
+# Session.client is not thread-safe, and clients may be created from the lambda worker pool
+_CLIENT_LOCK = threading.Lock()
+
+def create_client(service_name, **kwargs):
+    with _CLIENT_LOCK:
+        return SESSION.client(service_name, **kwargs)
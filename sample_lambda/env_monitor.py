@@ -1,33 +1,122 @@
 import logging
 import os
-import boto3
+import threading
+import time
 import json
+from botocore.config import Config
+from aws_session import create_client
+from log_level import get_log_level
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+logger.setLevel(get_log_level())
+
+# Keep TCP connections alive so warm invocations reuse the HTTPS connection. Short timeouts and
+# bounded retries keep a dead pooled connection (e.g. after a freeze) well within Alexa's 8s budget
+_CONFIG = Config(tcp_keepalive=True, max_pool_connections=4, connect_timeout=1, read_timeout=2,
+                 retries={'max_attempts': 2, 'mode': 'standard'})
+
+# Seconds a reading is reused before DynamoDB is queried again
+_CACHE_TTL = float(os.environ.get('TempCacheTTL', '30'))
+
+# Seconds between background refreshes; shorter than the TTL so handlers normally find a fresh reading
+_REFRESH_INTERVAL = max(float(os.environ.get('EnvRefreshInterval', _CACHE_TTL / 2)), 1.0)
+
+# Seconds the handler waits for an in-flight background read before reading on its own
+_LOCK_TIMEOUT = 0.5
+
+# Created once per container so warm invocations reuse the SDK client and its connection pool.
+# A failure is kept and raised by EnvMonitor() so the module itself still imports without config
+_INIT_ERROR = None
+try:
+    _TABLE_NAME = os.environ['TableName']
+    _PARTITION_KEY = os.environ['PartitionKey']
+    _PARTITION_NAME = os.environ['PartitionName']
+    # botocore resolves the regional endpoint unless DynamoDBEndpoint overrides it. When the function
+    # runs in a VPC, add a com.amazonaws.<region>.dynamodb gateway endpoint to its route table so
+    # DynamoDB is reached over the AWS network instead of a NAT gateway
+    _ENDPOINT_URL = os.environ.get('DynamoDBEndpoint')
+    if _ENDPOINT_URL:
+        _CLIENT = create_client('dynamodb', endpoint_url=_ENDPOINT_URL, config=_CONFIG)
+    else:
+        _CLIENT = create_client('dynamodb', config=_CONFIG)
+except Exception as error:
+    logger.error("Failed to initialize DynamoDB client: %s", error)
+    _INIT_ERROR = error
+    _CLIENT = None
 
 class EnvMonitor:
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb', region_name=os.environ['Region'])
-        self.table = self.dynamodb.Table(os.environ['TableName'])
+        if _CLIENT is None:
+            raise RuntimeError("DynamoDB client is not initialized") from _INIT_ERROR
+        self.client = _CLIENT
+        self.updated_at = None
+        # held while a read is in flight so the handler and the refresh thread never read at once
+        self.lock = threading.Lock()
 
         self.update_data()
 
+        # no background refresh when caching is turned off
+        self.refresh_thread = None
+        if _CACHE_TTL > 0:
+            self.refresh_thread = threading.Thread(target=self.refresh_loop, daemon=True)
+            self.refresh_thread.start()
+
     def get_temperature(self):
-        self.update_data()
+        self.refresh_data()
         return float(self.temperature)
 
     def get_humidity(self):
-        self.update_data()
+        self.refresh_data()
         return float(self.humidity)
 
     def get_pressure(self):
-        self.update_data()
+        self.refresh_data()
         return float(self.pressure)
 
+    def refresh_data(self):
+        # ambient values change slowly, so a reading within the TTL is reused across invocations.
+        # the background thread keeps it fresh; a synchronous read is only needed after the
+        # container was frozen longer than the TTL
+        if self.is_fresh(_CACHE_TTL):
+            return
+        # wait briefly for an in-flight background read; it may be stuck on a connection that died
+        # while the container was frozen, so the handler then reads on its own instead
+        if not self.lock.acquire(timeout=_LOCK_TIMEOUT):
+            self.update_data()
+            return
+        try:
+            # the refresh thread may have just finished a read while we waited
+            if not self.is_fresh(_CACHE_TTL):
+                self.update_data()
+        finally:
+            self.lock.release()
+
+    def is_fresh(self, max_age):
+        return self.updated_at is not None and time.monotonic() - self.updated_at < max_age
+
+    def refresh_loop(self):
+        while True:
+            time.sleep(_REFRESH_INTERVAL)
+            # skip when a read already happened within the interval, e.g. the handler's own
+            # synchronous read on the first invocation after the container was frozen
+            if self.is_fresh(_REFRESH_INTERVAL) or not self.lock.acquire(blocking=False):
+                continue
+            try:
+                self.update_data()
+            except Exception as error:
+                logger.error("Failed to refresh env data: %s", error)
+            finally:
+                self.lock.release()
+
     def update_data(self):
-        response = self.table.get_item(Key = {os.environ['PartitionKey']: os.environ['PartitionName']})
+        # only the attributes read below are fetched; values arrive as DynamoDB number strings
+        response = self.client.get_item(
+            TableName = _TABLE_NAME,
+            Key = {_PARTITION_KEY: {'S': _PARTITION_NAME}},
+            ProjectionExpression = 'temperature, humidity, pressure',
+            ConsistentRead = False)
         logger.info(response)
-        self.temperature = response["Item"]["temperature"]
-        self.humidity = response["Item"]["humidity"]
-        self.pressure = response["Item"]["pressure"]
+        self.temperature = response["Item"]["temperature"]["N"]
+        self.humidity = response["Item"]["humidity"]["N"]
+        self.pressure = response["Item"]["pressure"]["N"]
+        self.updated_at = time.monotonic()
@@ -22,23 +22,44 @@ Note that this example does not deal with user authentication, only uses virtual
 a lot of implementation and error handling to keep the code simple and focused.
 """
 
+import concurrent.futures
+import functools
 import logging
+import os
 import time
 import json
-import uuid
 
-# Imports for v3 validation
-from validation import validate_message
+from log_level import get_log_level
+
+# orjson is used for log serialization when it is packaged with the function
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
 
 # Setup logger
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+logger.setLevel(get_log_level())
 
-from ac_remote import AcRemote
-ac_remote = AcRemote()
+# ac_remote and env_monitor (and boto3 with them) are imported on first use, so directives that
+# never touch the device, such as Discovery and AcceptGrant, skip that cold-start cost.
+# The instances are cached and reused across warm invocations.
+@functools.lru_cache(maxsize=None)
+def get_ac_remote():
+    from ac_remote import AcRemote
+    return AcRemote()
 
-from env_monitor import EnvMonitor
-env_monitor = EnvMonitor()
+@functools.lru_cache(maxsize=None)
+def get_env_monitor():
+    from env_monitor import EnvMonitor
+    return EnvMonitor()
+
+# workers for device reads that can run concurrently within a directive
+_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2)
 
 # To simplify this sample Lambda, we omit validation of access tokens and retrieval of a specific
 # user's appliances. Instead, this array includes a variety of virtual appliances in v2 API syntax,
@@ -63,6 +84,14 @@ SAMPLE_APPLIANCES = [
     }
 ]
 
+# SAMPLE_APPLIANCES never changes at runtime, so the v2 discovery payload is shared by every response
+_DISCOVERY_PAYLOAD = {
+    "discoveredAppliances": SAMPLE_APPLIANCES
+}
+
+# appliance lookup table keyed by applianceId
+_APPLIANCE_BY_ID = {appliance["applianceId"]: appliance for appliance in SAMPLE_APPLIANCES}
+
 def lambda_handler(request, context):
     """Main Lambda handler.
 
@@ -73,7 +102,8 @@ def lambda_handler(request, context):
 
     try:
         logger.info("Directive:")
-        logger.info(json.dumps(request, indent=4, sort_keys=True))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_dumps(request))
 
         version = get_directive_version(request)
 
@@ -92,9 +122,12 @@ def lambda_handler(request, context):
                 response = handle_non_discovery(request)
 
         logger.info("Response:")
-        logger.info(json.dumps(response, indent=4, sort_keys=True))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_dumps(response))
 
+        # v3 validation pulls in jsonschema, so it is imported only when enabled
         #if version == "3":
+            #from validation import validate_message
             #logger.info("Validate v3 response")
             #validate_message(request, response)
 
@@ -111,34 +144,26 @@ def handle_discovery():
         "payloadVersion": "2",
         "messageId": get_uuid()
     }
-    payload = {
-        "discoveredAppliances": SAMPLE_APPLIANCES
-    }
     response = {
         "header": header,
-        "payload": payload
+        "payload": _DISCOVERY_PAYLOAD
     }
     return response
 
 def handle_non_discovery(request):
-    request_name = request["header"]["name"]
-
-    if request_name == "TurnOnRequest":
-        header = {
-            "namespace": "Alexa.ConnectedHome.Control",
-            "name": "TurnOnConfirmation",
-            "payloadVersion": "2",
-            "messageId": get_uuid()
-        }
-        payload = {}
-    elif request_name == "TurnOffRequest":
-        header = {
-            "namespace": "Alexa.ConnectedHome.Control",
-            "name": "TurnOffConfirmation",
-            "payloadVersion": "2",
-            "messageId": get_uuid()
-        }
+    handler = _V2_HANDLERS.get(request["header"]["name"])
+    if handler:
+        return handler(request)
     # other handlers omitted in this example
+    return None
+
+def handle_turn_on_request(request):
+    header = {
+        "namespace": "Alexa.ConnectedHome.Control",
+        "name": "TurnOnConfirmation",
+        "payloadVersion": "2",
+        "messageId": get_uuid()
+    }
     payload = {}
     response = {
         "header": header,
@@ -146,234 +171,253 @@ def handle_non_discovery(request):
     }
     return response
 
+def handle_turn_off_request(request):
+    header = {
+        "namespace": "Alexa.ConnectedHome.Control",
+        "name": "TurnOffConfirmation",
+        "payloadVersion": "2",
+        "messageId": get_uuid()
+    }
+    payload = {}
+    response = {
+        "header": header,
+        "payload": payload
+    }
+    return response
+
+# v2 directive name -> handler
+_V2_HANDLERS = {
+    "TurnOnRequest": handle_turn_on_request,
+    "TurnOffRequest": handle_turn_off_request
+}
+
 # v2 utility functions
 def get_appliance_by_appliance_id(appliance_id):
-    for appliance in SAMPLE_APPLIANCES:
-        if appliance["applianceId"] == appliance_id:
-            return appliance
-    return None
+    return _APPLIANCE_BY_ID.get(appliance_id)
 
 def get_utc_timestamp(seconds=None):
     return time.strftime("%Y-%m-%dT%H:%M:%S.00Z", time.gmtime(seconds))
 
 def get_uuid():
-    return str(uuid.uuid4())
+    # random (version 4) UUID string formatted directly from os.urandom, without the uuid module
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0f) | 0x40
+    b[8] = (b[8] & 0x3f) | 0x80
+    return f"{b[:4].hex()}-{b[4:6].hex()}-{b[6:8].hex()}-{b[8:10].hex()}-{b[10:].hex()}"
 
 # v3 handlers
 def handle_discovery_v3(request):
-    endpoints = []
-    for appliance in SAMPLE_APPLIANCES:
-        endpoints.append(get_endpoint_from_v2_appliance(appliance))
+    return get_event_v3("Discover.Response", namespace="Alexa.Discovery", payload=_DISCOVERY_V3_PAYLOAD)
 
-    response = {
-        "event": {
-            "header": {
-                "namespace": "Alexa.Discovery",
-                "name": "Discover.Response",
-                "payloadVersion": "3",
-                "messageId": get_uuid()
-            },
-            "payload": {
-                "endpoints": endpoints
-            }
-        }
+def handle_non_discovery_v3(request):
+    # read the directive fields shared by every handler once
+    directive = request["directive"]
+    header = directive["header"]
+    correlation_token = header.get("correlationToken")
+    endpoint_id = directive.get("endpoint", {}).get("endpointId")
+
+    handler = _V3_HANDLERS.get(header["namespace"], {}).get(header["name"])
+    if handler:
+        return handler(directive, correlation_token, endpoint_id)
+    # other handlers omitted in this example
+    return None
+
+def handle_turn_on_v3(directive, correlation_token, endpoint_id):
+    ac_remote = get_ac_remote()
+    ac_remote.set_power_on()
+    return get_power_controller_response_v3(correlation_token, endpoint_id, "ON")
+
+def handle_turn_off_v3(directive, correlation_token, endpoint_id):
+    ac_remote = get_ac_remote()
+    ac_remote.set_power_off()
+    return get_power_controller_response_v3(correlation_token, endpoint_id, "OFF")
+
+def handle_set_target_temperature_v3(directive, correlation_token, endpoint_id):
+    ac_remote = get_ac_remote()
+    request_temperature = directive["payload"]["targetSetpoint"]["value"]
+    ac_remote.set_temperature(request_temperature)
+    return get_thermostat_controller_response_v3(correlation_token, endpoint_id)
+
+def handle_adjust_target_temperature_v3(directive, correlation_token, endpoint_id):
+    ac_remote = get_ac_remote()
+    request_temperature = ac_remote.get_temperature() + directive["payload"]["targetSetpointDelta"]["value"]
+    ac_remote.set_temperature(request_temperature)
+    return get_thermostat_controller_response_v3(correlation_token, endpoint_id)
+
+def handle_set_thermostat_mode_v3(directive, correlation_token, endpoint_id):
+    ac_remote = get_ac_remote()
+    request_mode = directive["payload"]["thermostatMode"]["value"]
+
+    if request_mode == "HEAT":
+        ac_remote.set_mode_heat()
+    elif request_mode == "COOL":
+        ac_remote.set_mode_cool()
+    return get_thermostat_controller_response_v3(correlation_token, endpoint_id)
+
+def handle_report_state_v3(directive, correlation_token, endpoint_id):
+    snapshot = get_state_snapshot_v3()
+    response = get_event_v3("StateReport", correlation_token, endpoint_id)
+    response["context"] = {
+        "properties": get_properties_v3(snapshot, REPORT_STATE_PROPERTIES)
     }
     return response
 
-def handle_non_discovery_v3(request):
-    request_namespace = request["directive"]["header"]["namespace"]
-    request_name = request["directive"]["header"]["name"]
+def handle_accept_grant_v3(directive, correlation_token, endpoint_id):
+    print("====== AcceptGrant directive is called. Your authorization code is :" + directive["payload"]["grant"]["code"]);
+    return get_event_v3("AcceptGrant.Response", namespace="Alexa.Authorization")
 
-    if request_namespace == "Alexa.PowerController":
-        if request_name == "TurnOn":
-            value = "ON"
-            ac_remote.set_power_on()
-        else:
-            value = "OFF"
-            ac_remote.set_power_off()
-
-        response = {
-            "context": {
-                "properties": [
-                    {
-                        "namespace": "Alexa.PowerController",
-                        "name": "powerState",
-                        "value": value,
-                        "timeOfSample": get_utc_timestamp(),
-                        "uncertaintyInMilliseconds": 0
-                    }
-                ]
-            },
-            "event": {
-                "header": {
-                    "namespace": "Alexa",
-                    "name": "Response",
-                    "payloadVersion": "3",
-                    "messageId": get_uuid(),
-                    "correlationToken": request["directive"]["header"]["correlationToken"]
-                },
-                "endpoint": {
-                    "scope": {
-                        "type": "BearerToken",
-                        "token": "access-token-from-Amazon"
-                    },
-                    "endpointId": request["directive"]["endpoint"]["endpointId"]
-                },
-                "payload": {}
+def get_power_controller_response_v3(correlation_token, endpoint_id, value):
+    # all properties in a single response share the same sample time
+    now_ts = get_utc_timestamp()
+    response = get_event_v3("Response", correlation_token, endpoint_id, scope=_BEARER_TOKEN_SCOPE)
+    response["context"] = {
+        "properties": [
+            {
+                "namespace": "Alexa.PowerController",
+                "name": "powerState",
+                "value": value,
+                "timeOfSample": now_ts,
+                "uncertaintyInMilliseconds": 0
             }
-        }
-        return response
+        ]
+    }
+    return response
 
-    elif request_namespace == "Alexa.ThermostatController":
-        if request_name == "SetTargetTemperature":
-            request_temperature = request["directive"]["payload"]["targetSetpoint"]["value"]
-            ac_remote.set_temperature(request_temperature)
-            
-        elif request_name == "AdjustTargetTemperature":
-            request_temperature = ac_remote.get_temperature() + request["directive"]["payload"]["targetSetpointDelta"]["value"]
-            ac_remote.set_temperature(request_temperature)
-            
-        elif request_name == "SetThermostatMode":
-            request_mode = request["directive"]["payload"]["thermostatMode"]["value"]
-            
-            if request_mode == "HEAT":
-                ac_remote.set_mode_heat()
-            elif request_mode == "COOL":
-                ac_remote.set_mode_cool()
-
-        response = {
-            "event": {
-                "header": {
-                    "namespace": "Alexa",
-                    "name": "Response",
-                    "messageId": get_uuid(),
-                    "correlationToken": request["directive"]["header"]["correlationToken"],
-                    "payloadVersion": "3"
-                },
-                "endpoint": {
-                    "endpointId": request["directive"]["endpoint"]["endpointId"]
-                },
-                "payload": {}
-            },
-            "context": {
-                "properties": [
-                    {
-                        "namespace": "Alexa.ThermostatController",
-                        "name": "thermostatMode",
-                        "value": ac_remote.get_mode(),
-                        "timeOfSample": get_utc_timestamp(),
-                        "uncertaintyInMilliseconds": 0
-                    },
-                    {
-                        "namespace": "Alexa.ThermostatController",
-                        "name": "targetSetpoint",
-                        "value": {
-                            "value": ac_remote.get_temperature(),
-                            "scale": "CELSIUS"
-                        },
-                        "timeOfSample": get_utc_timestamp(),
-                        "uncertaintyInMilliseconds": 0
-                    },
-                    {
-                        "namespace": "Alexa.TemperatureSensor",
-                        "name": "temperature",
-                        "value": {
-                            "value": env_monitor.get_temperature(),
-                            "scale": "CELSIUS"
-                        },
-                        "timeOfSample": get_utc_timestamp(),
-                        "uncertaintyInMilliseconds": 0
-                    }
-                ]
-            }
-        }
-        return response
+def get_thermostat_controller_response_v3(correlation_token, endpoint_id):
+    snapshot = get_state_snapshot_v3()
+    response = get_event_v3("Response", correlation_token, endpoint_id)
+    response["context"] = {
+        "properties": get_properties_v3(snapshot, THERMOSTAT_CONTROLLER_PROPERTIES)
+    }
+    return response
 
-    elif request_namespace == "Alexa":
-        if request_name == "ReportState":
-            response = {
-                "event": {
-                    "header": {
-                        "namespace": "Alexa",
-                        "name": "StateReport",
-                        "messageId": get_uuid(),
-                        "correlationToken": request["directive"]["header"]["correlationToken"],
-                        "payloadVersion": "3"
-                    },
-                    "endpoint": {
-                        "endpointId": request["directive"]["endpoint"]["endpointId"]
-                    },
-                    "payload": {}
-                },
-                "context": {
-                    "properties": [
-                        {
-                            "namespace": "Alexa.ThermostatController",
-                            "name": "thermostatMode",
-                            "value": ac_remote.get_mode(),
-                            "timeOfSample": get_utc_timestamp(),
-                            "uncertaintyInMilliseconds": 0
-                        },
-                        {
-                            "namespace": "Alexa.ThermostatController",
-                            "name": "targetSetpoint",
-                            "value": {
-                                "value": ac_remote.get_temperature(),
-                                "scale": "CELSIUS"
-                            },
-                            "timeOfSample": get_utc_timestamp(),
-                            "uncertaintyInMilliseconds": 0
-                        },
-                        {
-                            "namespace": "Alexa.PowerController",
-                            "name": "powerState",
-                            "value": ac_remote.get_power(),
-                            "timeOfSample": get_utc_timestamp(),
-                            "uncertaintyInMilliseconds": 0
-                        },
-                        {
-                            "namespace": "Alexa.TemperatureSensor",
-                            "name": "temperature",
-                            "value": {
-                                "value": env_monitor.get_temperature(),
-                                "scale": "CELSIUS"
-                            },
-                            "timeOfSample": get_utc_timestamp(),
-                            "uncertaintyInMilliseconds": 0
-                        },
-                        {
-                            "namespace": "Alexa.EndpointHealth",
-                            "name": "connectivity",
-                            "value": {
-                                "value": "OK"
-                            },
-                            "timeOfSample": get_utc_timestamp(),
-                            "uncertaintyInMilliseconds": 0
-                        }
-                    ]
-                }
-            }
-            return response
-
-    elif request_namespace == "Alexa.Authorization":
-        if request_name == "AcceptGrant":
-            print("====== AcceptGrant directive is called. Your authorization code is :" + request["directive"]["payload"]["grant"]["code"]);
-            response = {
-                "event": {
-                    "header": {
-                        "namespace": "Alexa.Authorization",
-                        "name": "AcceptGrant.Response",
-                        "payloadVersion": "3",
-                        "messageId": get_uuid()
-                    },
-                    "payload": {}
-                }
-            }
-            return response
+# context properties reported by each response type
+THERMOSTAT_CONTROLLER_PROPERTIES = ("thermostatMode", "targetSetpoint", "temperature")
+REPORT_STATE_PROPERTIES = ("thermostatMode", "targetSetpoint", "powerState", "temperature", "connectivity")
+
+def get_state_snapshot_v3():
+    # read every device value once; all properties in a single response share the same sample time.
+    # the DynamoDB read runs alongside the IoT shadow read since neither depends on the other.
+    future_env = _POOL.submit(lambda: get_env_monitor().get_temperature())
+    state = get_ac_remote().get_state()
+    return {
+        "mode": state["mode"],
+        "temp": state["temp"],
+        "power": state["power"],
+        "env": future_env.result(),
+        "ts": get_utc_timestamp()
+    }
 
-    # other handlers omitted in this example
+def get_properties_v3(snapshot, include):
+    return [_PROPERTY_BUILDERS_V3[name](snapshot) for name in include]
+
+def get_thermostat_mode_property_v3(snapshot):
+    return {
+        "namespace": "Alexa.ThermostatController",
+        "name": "thermostatMode",
+        "value": snapshot["mode"],
+        "timeOfSample": snapshot["ts"],
+        "uncertaintyInMilliseconds": 0
+    }
+
+def get_target_setpoint_property_v3(snapshot):
+    return {
+        "namespace": "Alexa.ThermostatController",
+        "name": "targetSetpoint",
+        "value": {
+            "value": snapshot["temp"],
+            "scale": "CELSIUS"
+        },
+        "timeOfSample": snapshot["ts"],
+        "uncertaintyInMilliseconds": 0
+    }
+
+def get_power_state_property_v3(snapshot):
+    return {
+        "namespace": "Alexa.PowerController",
+        "name": "powerState",
+        "value": snapshot["power"],
+        "timeOfSample": snapshot["ts"],
+        "uncertaintyInMilliseconds": 0
+    }
+
+def get_temperature_property_v3(snapshot):
+    return {
+        "namespace": "Alexa.TemperatureSensor",
+        "name": "temperature",
+        "value": {
+            "value": snapshot["env"],
+            "scale": "CELSIUS"
+        },
+        "timeOfSample": snapshot["ts"],
+        "uncertaintyInMilliseconds": 0
+    }
+
+def get_connectivity_property_v3(snapshot):
+    return {
+        "namespace": "Alexa.EndpointHealth",
+        "name": "connectivity",
+        "value": {
+            "value": "OK"
+        },
+        "timeOfSample": snapshot["ts"],
+        "uncertaintyInMilliseconds": 0
+    }
+
+# context property name -> builder; only the properties a response reports are built
+_PROPERTY_BUILDERS_V3 = {
+    "thermostatMode": get_thermostat_mode_property_v3,
+    "targetSetpoint": get_target_setpoint_property_v3,
+    "powerState": get_power_state_property_v3,
+    "temperature": get_temperature_property_v3,
+    "connectivity": get_connectivity_property_v3
+}
+
+# v3 directive namespace -> name -> handler
+_V3_HANDLERS = {
+    "Alexa.PowerController": {
+        "TurnOn": handle_turn_on_v3,
+        "TurnOff": handle_turn_off_v3
+    },
+    "Alexa.ThermostatController": {
+        "SetTargetTemperature": handle_set_target_temperature_v3,
+        "AdjustTargetTemperature": handle_adjust_target_temperature_v3,
+        "SetThermostatMode": handle_set_thermostat_mode_v3
+    },
+    "Alexa": {
+        "ReportState": handle_report_state_v3
+    },
+    "Alexa.Authorization": {
+        "AcceptGrant": handle_accept_grant_v3
+    }
+}
 
 # v3 utility functions
+_BEARER_TOKEN_SCOPE = {
+    "type": "BearerToken",
+    "token": "access-token-from-Amazon"
+}
+
+def get_event_v3(name, correlation_token=None, endpoint_id=None, namespace="Alexa", payload=None, scope=None):
+    # common v3 response envelope; correlationToken and endpoint are only set when given
+    header = {
+        "namespace": namespace,
+        "name": name,
+        "payloadVersion": "3",
+        "messageId": get_uuid()
+    }
+    if correlation_token is not None:
+        header["correlationToken"] = correlation_token
+    event = {
+        "header": header,
+        "payload": payload if payload is not None else {}
+    }
+    if endpoint_id is not None:
+        event["endpoint"] = {"endpointId": endpoint_id}
+        if scope is not None:
+            event["endpoint"]["scope"] = scope
+    return {"event": event}
+
 def get_endpoint_from_v2_appliance(appliance):
     endpoint = {
         "endpointId": appliance["applianceId"],
@@ -398,98 +442,108 @@ def get_directive_version(request):
             return "-1"
 
 def get_endpoint_by_endpoint_id(endpoint_id):
-    appliance = get_appliance_by_appliance_id(endpoint_id)
-    if appliance:
-        return get_endpoint_from_v2_appliance(appliance)
-    return None
-
-def get_display_categories_from_v2_appliance(appliance):
-    model_name = appliance["modelName"]
-    if model_name == "Smart Thermostat": displayCategories = ["THERMOSTAT"]
-    else: displayCategories = ["OTHER"]
-    return displayCategories
-
-def get_capabilities_from_v2_appliance(appliance):
-    model_name = appliance["modelName"]
-    if model_name == "Smart Thermostat":
-        capabilities = [
-            {
-                "type": "AlexaInterface",
-                "interface": "Alexa.ThermostatController",
-                "version": "3",
-                "properties": {
-                    "supported": [
-                        { "name": "targetSetpoint" },
-                        { "name": "thermostatMode" }
-                    ],
-                    "proactivelyReported": True,
-                    "retrievable": True
-                },
-                "configuration": {
-                    "supportedModes": [ "HEAT", "COOL" ],
-                    "supportsScheduling": False
-                }
-            },
-            {
-                "type": "AlexaInterface",
-                "interface": "Alexa.PowerController",
-                "version": "3",
-                "properties": {
-                    "supported": [
-                        { "name": "powerState" }
-                    ],
-                    "proactivelyReported": True,
-                    "retrievable": True
-                }
-            },
-            {
-                "type": "AlexaInterface",
-                "interface": "Alexa.TemperatureSensor",
-                "version": "3",
-                "properties": {
-                    "supported": [
-                        { "name": "temperature" }
-                    ],
-                    "proactivelyReported": True,
-                    "retrievable": True
-                }
-            }
-        ]
-    else:
-        # in this example, just return simple on/off capability
-        capabilities = [
-            {
-                "type": "AlexaInterface",
-                "interface": "Alexa.PowerController",
-                "version": "3",
-                "properties": {
-                    "supported": [
-                        { "name": "powerState" }
-                    ],
-                    "proactivelyReported": True,
-                    "retrievable": True
-                }
-            }
-        ]
+    return _ENDPOINT_BY_ID.get(endpoint_id)
 
-    # additional capabilities that are required for each endpoint
-    endpoint_health_capability = {
+# static capability payloads; they depend only on the appliance modelName, so they are built once
+_THERMOSTAT_CAPABILITIES = [
+    {
+        "type": "AlexaInterface",
+        "interface": "Alexa.ThermostatController",
+        "version": "3",
+        "properties": {
+            "supported": [
+                { "name": "targetSetpoint" },
+                { "name": "thermostatMode" }
+            ],
+            "proactivelyReported": True,
+            "retrievable": True
+        },
+        "configuration": {
+            "supportedModes": [ "HEAT", "COOL" ],
+            "supportsScheduling": False
+        }
+    },
+    {
         "type": "AlexaInterface",
-        "interface": "Alexa.EndpointHealth",
+        "interface": "Alexa.PowerController",
         "version": "3",
         "properties": {
-            "supported":[
-                { "name":"connectivity" }
+            "supported": [
+                { "name": "powerState" }
+            ],
+            "proactivelyReported": True,
+            "retrievable": True
+        }
+    },
+    {
+        "type": "AlexaInterface",
+        "interface": "Alexa.TemperatureSensor",
+        "version": "3",
+        "properties": {
+            "supported": [
+                { "name": "temperature" }
             ],
             "proactivelyReported": True,
             "retrievable": True
         }
     }
-    alexa_interface_capability = {
+]
+
+# in this example, other models just return simple on/off capability
+_DEFAULT_CAPABILITIES = [
+    {
         "type": "AlexaInterface",
-        "interface": "Alexa",
-        "version": "3"
+        "interface": "Alexa.PowerController",
+        "version": "3",
+        "properties": {
+            "supported": [
+                { "name": "powerState" }
+            ],
+            "proactivelyReported": True,
+            "retrievable": True
+        }
     }
-    capabilities.append(endpoint_health_capability)
-    capabilities.append(alexa_interface_capability)
-    return capabilities
+]
+
+# additional capabilities that are required for each endpoint
+_ENDPOINT_HEALTH_CAPABILITY = {
+    "type": "AlexaInterface",
+    "interface": "Alexa.EndpointHealth",
+    "version": "3",
+    "properties": {
+        "supported":[
+            { "name":"connectivity" }
+        ],
+        "proactivelyReported": True,
+        "retrievable": True
+    }
+}
+_ALEXA_INTERFACE_CAPABILITY = {
+    "type": "AlexaInterface",
+    "interface": "Alexa",
+    "version": "3"
+}
+
+_CAPABILITIES_BY_MODEL = {
+    "Smart Thermostat": _THERMOSTAT_CAPABILITIES + [_ENDPOINT_HEALTH_CAPABILITY, _ALEXA_INTERFACE_CAPABILITY]
+}
+_DEFAULT_MODEL_CAPABILITIES = _DEFAULT_CAPABILITIES + [_ENDPOINT_HEALTH_CAPABILITY, _ALEXA_INTERFACE_CAPABILITY]
+
+_DISPLAY_CATEGORIES_BY_MODEL = {
+    "Smart Thermostat": ["THERMOSTAT"]
+}
+_DEFAULT_DISPLAY_CATEGORIES = ["OTHER"]
+
+def get_display_categories_from_v2_appliance(appliance):
+    return _DISPLAY_CATEGORIES_BY_MODEL.get(appliance["modelName"], _DEFAULT_DISPLAY_CATEGORIES)
+
+def get_capabilities_from_v2_appliance(appliance):
+    return _CAPABILITIES_BY_MODEL.get(appliance["modelName"], _DEFAULT_MODEL_CAPABILITIES)
+
+# v3 endpoints, transformed once from SAMPLE_APPLIANCES at import time
+_DISCOVERY_V3_PAYLOAD = {
+    "endpoints": [get_endpoint_from_v2_appliance(appliance) for appliance in SAMPLE_APPLIANCES]
+}
+
+# endpoint lookup table keyed by endpointId
+_ENDPOINT_BY_ID = {endpoint["endpointId"]: endpoint for endpoint in _DISCOVERY_V3_PAYLOAD["endpoints"]}
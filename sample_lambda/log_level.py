@@ -0,0 +1,16 @@
+import logging
+import os
+
+# Lambda's AWS_LAMBDA_LOG_LEVEL names that differ from the logging module's level names
+_LEVEL_ALIASES = {
+    'TRACE': 'DEBUG',
+    'WARN': 'WARNING',
+    'FATAL': 'CRITICAL'
+}
+
+def get_log_level():
+    # LOG_LEVEL, then AWS_LAMBDA_LOG_LEVEL; unknown values fall back to INFO
+    name = os.environ.get('LOG_LEVEL', os.environ.get('AWS_LAMBDA_LOG_LEVEL', 'INFO')).strip().upper()
+    name = _LEVEL_ALIASES.get(name, name)
+    level = logging.getLevelName(name)
+    return level if isinstance(level, int) else logging.INFO